@@ -1,6 +1,11 @@
 import abc
 import logging
 import getpass
+import re
+import sqlite3
+from collections import defaultdict
+
+import numpy as np
 import plexapi.playlist
 import plexapi.audio
 from plexapi.exceptions import BadRequest, NotFound
@@ -11,12 +16,103 @@ from typing import List, Optional, Union
 from sync_items import AudioTag, Playlist
 
 
+# SQL statements for the MediaMonkey database. Defined once at module level so
+# that the per-connection statement cache can key on the SQL text and reuse the
+# same prepared statement across invocations.
+PLAYLIST_CHILDREN_SQL = """
+	SELECT IDPlaylist, PlaylistName, isAutoPlaylist
+	FROM Playlists
+	WHERE ParentPlaylist = ?
+	ORDER BY PlaylistName
+"""
+
+PLAYLIST_TRACKS_SQL = """
+	SELECT ps.IDPlaylist, s.ID, s.SongTitle, s.Artist, s.Album, s.TrackNumber, s.Rating, s.SongPath
+	FROM PlaylistSongs ps
+	INNER JOIN Songs s ON s.ID = ps.IDSong
+	WHERE ps.IDPlaylist IN ({})
+	ORDER BY ps.IDPlaylist, ps.SongOrder
+"""
+
+PLAYLIST_TRACKS_CACHE_SQL = """
+	SELECT ps.IDPlaylist, s.ID, s.SongTitle, s.Artist, s.Album, s.TrackNumber, s.Rating, s.SongPath
+	FROM cache.playlist_songs ps
+	INNER JOIN Songs s ON s.ID = ps.IDSong
+	WHERE ps.IDPlaylist IN ({})
+	ORDER BY ps.IDPlaylist, ps.SongOrder
+"""
+
+# SQLite limits the number of bound variables per statement, so IN clauses
+# are issued in chunks of this size
+SQLITE_MAX_VARIABLES = 500
+
+TRACK_BY_ID_SQL = """
+	SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
+	FROM Songs
+	WHERE ID = ?
+"""
+
+RATED_TRACKS_SQL = """
+	SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
+	FROM Songs
+	WHERE Rating > 0
+"""
+
+RATED_TRACKS_CACHE_SQL = """
+	SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
+	FROM cache.rated
+"""
+
+# Rating conditions like "> 50" are split into a whitelisted operator and a
+# bound operand, so every threshold reuses one of these canonical statements
+# instead of compiling a new query per value
+RATING_CONDITION_RE = re.compile(r'^\s*(<=|>=|<>|!=|=|<|>)\s*(-?\d+(?:\.\d+)?)\s*$')
+
+RATING_COMPARE_SQL = {
+	operator: """
+	SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
+	FROM Songs
+	WHERE Rating {} ?
+""".format(operator)
+	for operator in ('<', '<=', '=', '!=', '<>', '>=', '>')
+}
+
+TRACK_BY_TITLE_SQL = """
+	SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
+	FROM Songs
+	WHERE SongTitle = ?
+"""
+
+TRACK_BY_TITLE_FTS_SQL = """
+	SELECT s.ID, s.SongTitle, s.Artist, s.Album, s.TrackNumber, s.Rating, s.SongPath
+	FROM idx.songs_fts f
+	INNER JOIN Songs s ON s.ID = f.rowid
+	WHERE f.title MATCH ?
+"""
+
+UPDATE_RATING_SQL = """
+	UPDATE Songs
+	SET Rating = ?
+	WHERE ID = ?
+"""
+
+
 class MediaPlayer(abc.ABC):
 	album_empty_alias = ''
 	dry_run = False
 	reverse = False
 	rating_maximum = 5
 
+	def __init__(self):
+		# Normalization runs once per row on bulk reads, but ratings only
+		# take a handful of distinct values, so the division is memoized
+		# per value. A precomputed reciprocal is deliberately not used:
+		# x * (1 / max) differs from x / max in the last bit for some
+		# values, and sync compares normalized ratings for equality
+		# across players.
+		self._normed_cache = {}
+		self._format_cache = {}
+
 	@staticmethod
 	@abc.abstractmethod
 	def name():
@@ -38,6 +134,22 @@ class MediaPlayer(abc.ABC):
 		"""
 		return NotImplementedError
 
+	def format_cached(self, track):
+		"""
+		Memoized variant of :meth:`format`. The file handler always records
+		DEBUG, so the formatted string cannot be skipped with a level check;
+		instead it is built once per track, and repeated debug sites reuse
+		it rather than re-resolving artist and album - an HTTP round trip
+		each for Plex tracks.
+		"""
+		key = getattr(track, 'key', None) or getattr(track, 'ID', None)
+		if key is None:
+			return self.format(track)
+		formatted = self._format_cache.get(key)
+		if formatted is None:
+			formatted = self._format_cache.setdefault(key, self.format(track))
+		return formatted
+
 	def album_empty(self, album):
 		if not isinstance(album, str):
 			return False
@@ -60,9 +172,13 @@ class MediaPlayer(abc.ABC):
 		return normed_rating * self.rating_maximum
 
 	def get_normed_rating(self, rating: Optional[float]):
-		if (rating or 0) <= 0:
-			rating = 0
-		return rating / self.rating_maximum
+		rating = rating or 0
+		if rating <= 0:
+			return 0.0
+		normed = self._normed_cache.get(rating)
+		if normed is None:
+			normed = self._normed_cache.setdefault(rating, rating / self.rating_maximum)
+		return normed
 
 	@abc.abstractmethod
 	def read_playlists(self):
@@ -106,6 +222,19 @@ class MediaPlayer(abc.ABC):
 		"""
 		pass
 
+	def iter_search_tracks(self, key: str, value: Union[bool, str]):
+		"""Iterate over the tracks matching a search. Players that can
+		stream results override this so consumers start working before the
+		full search completes; the default yields from the materialized
+		search.
+
+		:param key: The search mode, as for :meth:`search_tracks`.
+		:param value: The value to search for.
+
+		:return: a generator of matching tracks
+		"""
+		yield from self.search_tracks(key, value)
+
 	@abc.abstractmethod
 	def update_playlist(self, playlist, track, present: bool):
 		"""Updates the playlist, unless in dry run
@@ -120,6 +249,13 @@ class MediaPlayer(abc.ABC):
 	def update_rating(self, track, rating):
 		"""Updates the rating of the track, unless in dry run"""
 
+	def update_ratings(self, pairs):
+		"""Updates the ratings of several tracks, unless in dry run
+		:param pairs: iterable of (track, rating) tuples
+		"""
+		for track, rating in pairs:
+			self.update_rating(track, rating)
+
 	def __hash__(self):
 		return hash(self.name().lower())
 
@@ -130,14 +266,20 @@ class MediaPlayer(abc.ABC):
 
 
 class MediaMonkey(MediaPlayer):
+	fetch_batch_size = 1000
 	rating_maximum = 100
 
 	def __init__(self):
 		super(MediaMonkey, self).__init__()
 		self.logger = logging.getLogger('PlexSync.MediaMonkey')
 		self.conn = None
+		self.conn_rw = None
 		self.cursor = None
 		self.db_path = None
+		self._stmt_cache = {}
+		self._fts_enabled = False
+		self._rated_cache_fresh = False
+		self._playlist_cache_fresh = False
 
 	@staticmethod
 	def name():
@@ -154,7 +296,6 @@ class MediaMonkey(MediaPlayer):
 		:param db_path: Path to MM.DB file. If None, attempts to auto-detect.
 		"""
 		self.logger.info('Connecting to local player {} database'.format(self.name()))
-		import sqlite3
 		import os
 		
 		# Auto-detect database location if not provided
@@ -187,9 +328,20 @@ class MediaMonkey(MediaPlayer):
 			self.db_path = db_path
 			# Open in read-only mode to prevent corruption and allow concurrent access
 			uri = 'file:{}?mode=ro'.format(db_path.replace('\\', '/'))
-			self.conn = sqlite3.connect(uri, uri=True)
+			# cached_statements sizes sqlite3's internal LRU of compiled
+			# statements, so repeated execute() calls with the same SQL text
+			# reuse the compiled program instead of re-parsing it
+			self.conn = sqlite3.connect(uri, uri=True, cached_statements=256)
 			self.conn.row_factory = sqlite3.Row  # Access columns by name
 			self.cursor = self.conn.cursor()
+			# Tune the connection for the read-heavy sync workload:
+			# a 64 MiB page cache, memory-mapped I/O to cut read syscalls,
+			# in-memory temp storage for ORDER BY spills, and query_only to
+			# match the read-only open mode
+			self.conn.execute("PRAGMA cache_size=-65536")
+			self.conn.execute("PRAGMA mmap_size=268435456")
+			self.conn.execute("PRAGMA temp_store=MEMORY")
+			self.conn.execute("PRAGMA query_only=1")
 			self.logger.info('Successfully connected to MediaMonkey database')
 			
 			# Verify database structure
@@ -197,10 +349,120 @@ class MediaMonkey(MediaPlayer):
 			if not self.cursor.fetchone():
 				self.logger.error('Invalid MediaMonkey database: Songs table not found')
 				exit(1)
+
+			self._build_title_index()
+			self._build_rated_cache()
+			self._prime_statement_cache()
 		except Exception as e:
 			self.logger.error('Failed to connect to MediaMonkey database: {}'.format(e))
 			exit(1)
 
+	def _build_title_index(self):
+		"""
+		Build an in-memory FTS5 index over song titles, attached alongside
+		the read-only database. Title searches then walk an inverted index
+		instead of scanning the Songs table. Falls back to exact-match
+		queries when FTS5 is not compiled into sqlite3.
+		"""
+		try:
+			# query_only also blocks writes to attached databases, so lift
+			# it while the index is built; the main database stays protected
+			# by its read-only open mode
+			self.conn.execute("PRAGMA query_only=0")
+			self.conn.execute("ATTACH DATABASE ':memory:' AS idx")
+			self.conn.execute("CREATE VIRTUAL TABLE idx.songs_fts USING fts5(title, content='')")
+			self.conn.execute(
+				"INSERT INTO idx.songs_fts(rowid, title)"
+				" SELECT ID, SongTitle FROM Songs WHERE SongTitle IS NOT NULL")
+			# End the implicit transaction the INSERT opened; its read lock
+			# on the main database would otherwise linger and block writers
+			self.conn.commit()
+			self._fts_enabled = True
+			self.logger.debug('Built FTS5 title index')
+		except sqlite3.OperationalError as e:
+			self._fts_enabled = False
+			self.logger.debug('FTS5 unavailable, using exact title matching: {}'.format(e))
+		finally:
+			self.conn.execute("PRAGMA query_only=1")
+
+	def _build_rated_cache(self):
+		"""
+		Snapshot hot tables into an attached in-memory scratch database.
+		The rated tracks become a walk of a small dedicated table instead
+		of a full Songs scan, since MediaMonkey gives no guarantee of an
+		index on Rating; that snapshot is marked stale as soon as ratings
+		are written back. PlaylistSongs gets a copy indexed on IDPlaylist,
+		so the bulk playlist-tracks JOIN probes an index instead of
+		scanning the membership table per chunk.
+		"""
+		try:
+			# As for the title index, lift query_only only while writing to
+			# the attached scratch database
+			self.conn.execute("PRAGMA query_only=0")
+			self.conn.execute("ATTACH DATABASE ':memory:' AS cache")
+			self.conn.execute(
+				"CREATE TABLE cache.rated AS"
+				" SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath"
+				" FROM Songs WHERE Rating > 0")
+			self.conn.commit()
+			self._rated_cache_fresh = True
+			self.logger.debug('Built rated-tracks snapshot')
+		except sqlite3.OperationalError as e:
+			self._rated_cache_fresh = False
+			self.logger.debug('Unable to build rated-tracks snapshot: {}'.format(e))
+		try:
+			self.conn.execute(
+				"CREATE TABLE cache.playlist_songs AS"
+				" SELECT IDPlaylist, IDSong, SongOrder FROM PlaylistSongs")
+			self.conn.execute("CREATE INDEX cache.idx_ps_playlist ON playlist_songs(IDPlaylist)")
+			self.conn.commit()
+			self._playlist_cache_fresh = True
+			self.logger.debug('Built playlist-membership snapshot')
+		except sqlite3.OperationalError as e:
+			self._playlist_cache_fresh = False
+			self.logger.debug('Unable to build playlist-membership snapshot: {}'.format(e))
+		finally:
+			self.conn.execute("PRAGMA query_only=1")
+
+	def _execute(self, sql, params=(), raw=False):
+		"""
+		Execute a statement on a cursor dedicated to its SQL text.
+		Keeping one cursor per statement means SQLite only parses and plans
+		each query once per connection instead of on every call.
+		:param sql: SQL text, ideally one of the module-level constants
+		:param params: bound parameters for the statement
+		:param raw: disable the sqlite3.Row factory on this statement's
+			cursor; bulk paths unpack columns positionally and save a Row
+			allocation plus name-based lookups per row
+		:return: the cursor holding the result set
+		"""
+		cursor = self._prepare(sql, raw)
+		cursor.execute(sql, params)
+		return cursor
+
+	def _prepare(self, sql, raw=False):
+		"""Create and cache the dedicated cursor for a statement without
+		executing it"""
+		cursor = self._stmt_cache.get(sql)
+		if cursor is None:
+			cursor = self._stmt_cache.setdefault(sql, self.conn.cursor())
+			if raw:
+				cursor.row_factory = None
+		return cursor
+
+	def _prime_statement_cache(self):
+		"""
+		Prepare the cursors for all hot statements up front. Rating-range
+		dispatch then resolves to an already-created cursor with a plain
+		dict hit, and the first search of a run pays no setup cost.
+		"""
+		for sql in RATING_COMPARE_SQL.values():
+			self._prepare(sql, raw=True)
+		self._prepare(RATED_TRACKS_CACHE_SQL if self._rated_cache_fresh else RATED_TRACKS_SQL, raw=True)
+		self._prepare(PLAYLIST_CHILDREN_SQL, raw=True)
+		self._prepare(TRACK_BY_TITLE_FTS_SQL if self._fts_enabled else TRACK_BY_TITLE_SQL, raw=True)
+		self._prepare(TRACK_BY_ID_SQL)
+
 	def create_playlist(self, title, tracks):
 		raise NotImplementedError
 
@@ -209,50 +471,53 @@ class MediaMonkey(MediaPlayer):
 
 	def read_child_playlists(self, parent_id, parent_name=''):
 		"""
-		Recursively read child playlists from database
+		Read child playlists from database, walking the hierarchy with an
+		explicit stack so deep playlist trees cannot exhaust the Python
+		recursion limit.
 		:param parent_id: Parent playlist ID (-1 for root)
 		:param parent_name: Parent playlist name for hierarchy
 		:rtype: list<Playlist>
 		"""
 		playlists = []
-		
-		# Query child playlists
-		query = """
-			SELECT IDPlaylist, PlaylistName, isAutoPlaylist
-			FROM Playlists
-			WHERE ParentPlaylist = ?
-			ORDER BY PlaylistName
-		"""
-		self.cursor.execute(query, (parent_id,))
-		
-		for row in self.cursor.fetchall():
-			playlist_id = row['IDPlaylist']
-			playlist_name = row['PlaylistName']
-			is_auto = bool(row['isAutoPlaylist'])
-			
-			playlist = Playlist(playlist_name, parent_name=parent_name)
-			playlist.is_auto_playlist = is_auto
-			playlists.append(playlist)
-			
-			if is_auto:
-				self.logger.debug('Skipping to read tracks for auto playlist {}'.format(playlist.name))
-			else:
-				# Read tracks for this playlist
-				track_query = """
-					SELECT s.ID, s.SongTitle, s.Artist, s.Album, s.TrackNumber, s.Rating, s.SongPath
-					FROM Songs s
-					INNER JOIN PlaylistSongs ps ON s.ID = ps.IDSong
-					WHERE ps.IDPlaylist = ?
-					ORDER BY ps.SongOrder
-				"""
-				self.cursor.execute(track_query, (playlist_id,))
-				for track_row in self.cursor.fetchall():
-					playlist.tracks.append(self._row_to_audiotag(track_row))
-			
-			# Recursively read child playlists
-			child_playlists = self.read_child_playlists(playlist_id, playlist.name)
-			playlists.extend(child_playlists)
-		
+		playlists_by_id = {}
+		stack = [(parent_id, parent_name)]
+
+		while stack:
+			parent_id, parent_name = stack.pop()
+
+			# Materialize the child rows before issuing nested queries, since
+			# those reuse the cursor of this statement's level
+			cursor = self._execute(PLAYLIST_CHILDREN_SQL, (parent_id,), raw=True)
+			rows = cursor.fetchall()
+
+			for playlist_id, playlist_name, is_auto in rows:
+				playlist = Playlist(playlist_name, parent_name=parent_name)
+				playlist.is_auto_playlist = bool(is_auto)
+				playlists.append(playlist)
+
+				if is_auto:
+					self.logger.debug('Skipping to read tracks for auto playlist {}'.format(playlist.name))
+				else:
+					playlists_by_id[playlist_id] = playlist
+
+				# Descend into child playlists
+				stack.append((playlist_id, playlist.name))
+
+		# Fetch the tracks of all non-auto playlists in one JOIN per chunk
+		# instead of one query per playlist
+		buckets = defaultdict(list)
+		playlist_ids = list(playlists_by_id)
+		template = PLAYLIST_TRACKS_CACHE_SQL if self._playlist_cache_fresh else PLAYLIST_TRACKS_SQL
+		for offset in range(0, len(playlist_ids), SQLITE_MAX_VARIABLES):
+			chunk = playlist_ids[offset:offset + SQLITE_MAX_VARIABLES]
+			query = template.format(', '.join('?' * len(chunk)))
+			cursor = self._execute(query, chunk, raw=True)
+			for track_row in cursor:
+				buckets[track_row[0]].append(self._row_to_audiotag(track_row[1:]))
+
+		for playlist_id, playlist in playlists_by_id.items():
+			playlist.tracks = buckets[playlist_id]
+
 		return playlists
 
 	def read_playlists(self):
@@ -262,23 +527,37 @@ class MediaMonkey(MediaPlayer):
 		self.logger.info('Found {} playlists'.format(len(playlists)))
 		return playlists
 
-	def _row_to_audiotag(self, row) -> AudioTag:
+	def _row_to_audiotag(self, row, rating=None) -> AudioTag:
 		"""
-		Convert database row to AudioTag object
-		:param row: sqlite3.Row object
+		Convert database row to AudioTag object. Columns are unpacked
+		positionally, so the bulk queries can skip the sqlite3.Row factory
+		and its per-row allocation plus name-based lookups.
+		:param row: (ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath) tuple
+		:param rating: already-normalized rating; computed from the row if None
 		:return: AudioTag instance
 		"""
-		artist = row['Artist'] or ''
-		album = row['Album'] or ''
-		title = row['SongTitle'] or ''
-		file_path = row['SongPath'] or ''
-		
-		tag = AudioTag(artist=artist, album=album, title=title, file_path=file_path)
-		tag.rating = self.get_normed_rating(row['Rating'])
-		tag.ID = row['ID']
-		tag.track = row['TrackNumber'] or 0
+		track_id, title, artist, album, track_number, raw_rating, file_path = row
+
+		tag = AudioTag(artist=artist or '', album=album or '', title=title or '', file_path=file_path or '')
+		tag.rating = self.get_normed_rating(raw_rating) if rating is None else rating
+		tag.ID = track_id
+		tag.track = track_number or 0
 		return tag
 
+	def _rows_to_audiotags(self, rows) -> List[AudioTag]:
+		"""
+		Convert a batch of database rows to AudioTag objects. The rating
+		column is normalized in a single NumPy operation, replacing one
+		Python division per row with one C loop over the whole batch.
+		:param rows: list of row tuples in _row_to_audiotag column order
+		:return: list of AudioTag instances
+		"""
+		# float64 so the result is bit-identical to the scalar division in
+		# get_normed_rating; sync compares ratings for equality
+		ratings = np.fromiter((row[5] or 0 for row in rows), dtype=np.float64, count=len(rows))
+		normed = np.maximum(ratings, 0) / self.rating_maximum
+		return [self._row_to_audiotag(row, rating) for row, rating in zip(rows, normed.tolist())]
+
 	def read_track_metadata(self, track) -> AudioTag:
 		"""
 		Read track metadata from database by ID
@@ -286,64 +565,62 @@ class MediaMonkey(MediaPlayer):
 		:return: AudioTag with full metadata
 		"""
 		track_id = track.ID if isinstance(track, AudioTag) else track
-		
-		query = """
-			SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
-			FROM Songs
-			WHERE ID = ?
-		"""
-		self.cursor.execute(query, (track_id,))
-		row = self.cursor.fetchone()
-		
+
+		cursor = self._execute(TRACK_BY_ID_SQL, (track_id,))
+		row = cursor.fetchone()
+
 		if row:
 			return self._row_to_audiotag(row)
 		else:
 			self.logger.warning('Track with ID {} not found in database'.format(track_id))
 			return None
 
-	def search_tracks(self, key: str, value: Union[bool, str]) -> List[AudioTag]:
+	def _search_cursor(self, key, value):
 		"""
-		Search for tracks in MediaMonkey database
+		Resolve a search mode to its executed cursor
 		:param key: Search mode ('title', 'rating', 'query')
 		:param value: Search value
-		:return: List of matching AudioTag objects
+		:return: the cursor holding the result set
 		"""
-		if not value:
-			raise ValueError(f"value can not be empty.")
-		
-		tags = []
-		
 		if key == "title":
-			# Search by exact title
-			query = """
-				SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
-				FROM Songs
-				WHERE SongTitle = ?
-			"""
 			self.logger.debug(f'Searching for tracks with title: {value}')
-			self.cursor.execute(query, (value,))
-			
+			cursor = None
+			if self._fts_enabled:
+				# Quote the title as an FTS5 phrase so query syntax inside
+				# track titles stays inert
+				phrase = '"{}"'.format(value.replace('"', '""'))
+				cursor = self._execute(TRACK_BY_TITLE_FTS_SQL, (phrase,), raw=True)
+				if cursor.fetchone() is None:
+					# Titles that tokenize to nothing (e.g. all punctuation)
+					# match no FTS phrase even when an exact row exists
+					cursor = None
+				else:
+					# Re-run the cached statement so the caller sees the
+					# full result set
+					cursor = self._execute(TRACK_BY_TITLE_FTS_SQL, (phrase,), raw=True)
+			if cursor is None:
+				# Search by exact title
+				cursor = self._execute(TRACK_BY_TITLE_SQL, (value,), raw=True)
+
 		elif key == "rating":
 			# Search by rating
 			if value is True:
-				# Get all rated tracks
-				query = """
-					SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
-					FROM Songs
-					WHERE Rating > 0
-				"""
+				# Get all rated tracks, preferring the snapshot built at
+				# connect time over a full Songs scan
 				self.logger.info('Reading tracks from the {} player'.format(self.name()))
-				self.cursor.execute(query)
+				if self._rated_cache_fresh:
+					cursor = self._execute(RATED_TRACKS_CACHE_SQL, raw=True)
+				else:
+					cursor = self._execute(RATED_TRACKS_SQL, raw=True)
 			else:
 				# Custom rating condition (e.g., "> 50", "= 100")
-				query = f"""
-					SELECT ID, SongTitle, Artist, Album, TrackNumber, Rating, SongPath
-					FROM Songs
-					WHERE Rating {value}
-				"""
-				self.logger.debug(f'Executing rating query: Rating {value}')
-				self.cursor.execute(query)
-				
+				condition = RATING_CONDITION_RE.match(value)
+				if condition is None:
+					raise ValueError(f"Invalid rating condition {value}.")
+				operator, operand = condition.groups()
+				self.logger.debug(f'Executing rating query: Rating {operator} {operand}')
+				cursor = self._execute(RATING_COMPARE_SQL[operator], (float(operand),), raw=True)
+
 		elif key == "query":
 			# Direct SQL query (advanced usage)
 			# Wrap in SELECT from Songs if not already a complete query
@@ -357,20 +634,64 @@ class MediaMonkey(MediaPlayer):
 				query = value
 			self.logger.debug(f'Executing custom query: {query}')
 			self.cursor.execute(query)
-			
+			cursor = self.cursor
+
 		else:
 			raise KeyError(f"Invalid search mode {key}.")
-		
-		# Fetch results and convert to AudioTag objects
-		for row in self.cursor.fetchall():
-			tags.append(self._row_to_audiotag(row))
-		
+
+		return cursor
+
+	def iter_search_tracks(self, key: str, value: Union[bool, str]):
+		"""
+		Generate matching AudioTags while SQLite steps through the result
+		set, so consumers can start working before the full search
+		completes. Rows are decoded in batches to keep the vectorized
+		rating normalization.
+		:param key: Search mode ('title', 'rating', 'query')
+		:param value: Search value
+		:return: generator of AudioTag objects
+		"""
+		if not value:
+			raise ValueError(f"value can not be empty.")
+
+		cursor = self._search_cursor(key, value)
+		while True:
+			rows = cursor.fetchmany(self.fetch_batch_size)
+			if not rows:
+				break
+			yield from self._rows_to_audiotags(rows)
+
+	def search_tracks(self, key: str, value: Union[bool, str]) -> List[AudioTag]:
+		"""
+		Search for tracks in MediaMonkey database
+		:param key: Search mode ('title', 'rating', 'query')
+		:param value: Search value
+		:return: List of matching AudioTag objects
+		"""
+		tags = list(self.iter_search_tracks(key, value))
 		self.logger.info(f'Found {len(tags)} tracks.')
 		return tags
 
 	def update_playlist(self, playlist, track, present):
 		raise NotImplementedError
 
+	def _ensure_write_connection(self):
+		"""
+		Lazily open a second, long-lived connection with write access. The
+		read-only connection, its cached statements and the attached title
+		index all stay untouched, so reads keep their warm caches while
+		writes go through here.
+		:return: the writable connection
+		"""
+		if self.conn_rw is None:
+			self.conn_rw = sqlite3.connect(self.db_path, cached_statements=256)
+			# WAL keeps MediaMonkey's own readers unblocked while we
+			# write; synchronous=NORMAL is safe under WAL and skips
+			# an fsync per commit
+			self.conn_rw.execute("PRAGMA journal_mode=WAL")
+			self.conn_rw.execute("PRAGMA synchronous=NORMAL")
+		return self.conn_rw
+
 	def update_rating(self, track, rating):
 		"""
 		Update track rating in MediaMonkey database
@@ -378,51 +699,54 @@ class MediaMonkey(MediaPlayer):
 		:param track: AudioTag with ID set
 		:param rating: Normalized rating (0-1)
 		"""
-		self.logger.debug('Updating rating of track "{}" to {} stars'.format(
-			self.format(track), self.get_5star_rating(rating))
-		)
-		if not self.dry_run:
-			# Check if database is read-only
-			if 'mode=ro' in str(self.db_path):
-				self.logger.error('Cannot update ratings: database opened in read-only mode')
-				self.logger.error('Restart with write access or close MediaMonkey')
-				return
-			
-			try:
-				# Reopen connection with write access if needed
-				if self.conn and not self.conn.execute("PRAGMA query_only").fetchone()[0] == 0:
-					self.conn.close()
-					self.conn = sqlite3.connect(self.db_path)
-					self.conn.row_factory = sqlite3.Row
-					self.cursor = self.conn.cursor()
-				
-				native_rating = self.get_native_rating(rating)
-				query = """
-					UPDATE Songs
-					SET Rating = ?
-					WHERE ID = ?
-				"""
-				self.cursor.execute(query, (native_rating, track.ID))
-				self.conn.commit()
-				self.logger.debug('Successfully updated rating for track ID {}'.format(track.ID))
-				
-			except sqlite3.OperationalError as e:
-				self.logger.error('Failed to update rating: {} (Is MediaMonkey running?)'.format(e))
-			except Exception as e:
-				self.logger.error('Unexpected error updating rating: {}'.format(e))
-				self.conn.rollback()
+		self.logger.debug('Updating rating of track "%s" to %s stars',
+			self.format_cached(track), self.get_5star_rating(rating))
+		self.update_ratings([(track, rating)])
+
+	def update_ratings(self, pairs):
+		"""
+		Update the ratings of several tracks in a single transaction, so the
+		journal and fsync cost is paid once per batch instead of per track
+		:param pairs: iterable of (AudioTag, normalized rating) tuples
+		"""
+		pairs = list(pairs)
+		if self.dry_run or not pairs:
+			return
+
+		try:
+			conn = self._ensure_write_connection()
+			with conn:
+				conn.executemany(
+					UPDATE_RATING_SQL,
+					[(self.get_native_rating(rating), track.ID) for track, rating in pairs]
+				)
+			# The live database has moved past the connect-time snapshot
+			self._rated_cache_fresh = False
+			self.logger.debug('Successfully updated ratings for {} tracks'.format(len(pairs)))
+
+		except sqlite3.OperationalError as e:
+			self.logger.error('Failed to update ratings: {} (Is MediaMonkey running?)'.format(e))
+		except Exception as e:
+			self.logger.error('Unexpected error updating ratings: {}'.format(e))
 	
 	def __del__(self):
-		"""Close database connection on cleanup"""
+		"""Close database connections on cleanup"""
 		if hasattr(self, 'conn') and self.conn:
 			self.conn.close()
+		if hasattr(self, 'conn_rw') and self.conn_rw:
+			self.conn_rw.close()
 
 
 class PlexPlayer(MediaPlayer):
 	# TODO logging needs to be updated to reflect whether Plex is source or destination
 	maximum_connection_attempts = 3
+	metadata_fetch_chunk_size = 200
+	search_container_size = 500
+	title_search_container_size = 100
 	rating_maximum = 10
 	album_empty_alias = '[Unknown Album]'
+	cache_path = '~/.plex_sync_cache.db'
+	section_key_path = '~/.plex_sync_section'
 
 	def __init__(self):
 		super(PlexPlayer, self).__init__()
@@ -430,6 +754,8 @@ class PlexPlayer(MediaPlayer):
 		self.account = None
 		self.plex_api_connection = None
 		self.music_library = None
+		self.cache_conn = None
+		self._track_cache = {}
 
 	@staticmethod
 	def name():
@@ -477,25 +803,241 @@ class PlexPlayer(MediaPlayer):
 			exit(1)
 
 		self.logger.info('Looking for music libraries')
-		music_libraries = {
-			section.key:
-				section for section
-				in self.plex_api_connection.library.sections()
-				if section.type == 'artist'}
-
-		if len(music_libraries) == 0:
-			self.logger.error('No music library found')
-			exit(1)
-		elif len(music_libraries) == 1:
-			self.music_library = list(music_libraries.values())[0]
-			self.logger.debug('Found 1 music library')
-		else:
-			print('Found multiple music libraries:')
-			for key, library in music_libraries.items():
-				print('\t[{}]: {}'.format(key, library.title))
+		self.music_library = self._load_cached_section()
+		if self.music_library is None:
+			music_libraries = {
+				section.key:
+					section for section
+					in self.plex_api_connection.library.sections()
+					if section.type == 'artist'}
+
+			if len(music_libraries) == 0:
+				self.logger.error('No music library found')
+				exit(1)
+			elif len(music_libraries) == 1:
+				self.music_library = list(music_libraries.values())[0]
+				self.logger.debug('Found 1 music library')
+			else:
+				print('Found multiple music libraries:')
+				for key, library in music_libraries.items():
+					print('\t[{}]: {}'.format(key, library.title))
 
-			choice = input('Select the library to sync with: ')
-			self.music_library = music_libraries[int(choice)]
+				choice = input('Select the library to sync with: ')
+				self.music_library = music_libraries[int(choice)]
+
+			self._store_section_key(self.music_library.key)
+
+		self._open_cache()
+
+	def _load_cached_section(self):
+		"""
+		Resolve the music library from the section key persisted by a
+		previous run, fetching it directly instead of listing all sections.
+		The key is only trusted for the server it was stored for: section
+		keys are small integers, so the same number can name a different
+		library on another server.
+		:return: the library section, or None when no valid key is cached
+		"""
+		import os
+		try:
+			with open(os.path.expanduser(self.section_key_path)) as key_file:
+				server_id, _, key = key_file.read().strip().partition(':')
+			if server_id != self.plex_api_connection.machineIdentifier:
+				self.logger.debug('Cached library selection belongs to a different server')
+				return None
+			section = self.plex_api_connection.library.sectionByID(int(key))
+			if section.type == 'artist':
+				self.logger.debug('Using cached music library selection: {}'.format(section.title))
+				return section
+		except FileNotFoundError:
+			pass
+		except (ValueError, OSError, NotFound, BadRequest) as e:
+			self.logger.debug('Cached library section is no longer valid: {}'.format(e))
+		return None
+
+	def _store_section_key(self, key):
+		"""Persist the selected section key, tied to the server's machine
+		identifier, so later runs skip the listing and, for multi-library
+		servers, the interactive prompt"""
+		import os
+		try:
+			with open(os.path.expanduser(self.section_key_path), 'w') as key_file:
+				key_file.write('{}:{}'.format(self.plex_api_connection.machineIdentifier, key))
+		except OSError as e:
+			self.logger.debug('Unable to persist library selection: {}'.format(e))
+
+	def _open_cache(self):
+		"""
+		Open the on-disk metadata cache, creating the schema on first use.
+		The cache turns the remote rated-tracks download into a local lookup
+		whenever the library has not changed since the previous sync. Rows
+		are scoped to their library section, so switching sections on the
+		same server cannot serve another section's tracks.
+		"""
+		import os
+		try:
+			self.cache_conn = sqlite3.connect(os.path.expanduser(self.cache_path))
+			# Caches written before rows were section-scoped lack the
+			# section_id column; they are disposable, so rebuild from scratch
+			columns = {row[1] for row in self.cache_conn.execute("PRAGMA table_info(tracks)")}
+			if columns and 'section_id' not in columns:
+				self.cache_conn.executescript(
+					"DROP TABLE IF EXISTS tracks; DROP TABLE IF EXISTS library_state;")
+			self.cache_conn.executescript("""
+				CREATE TABLE IF NOT EXISTS tracks (
+					key INTEGER PRIMARY KEY,
+					section_id INT,
+					artist TEXT,
+					album TEXT,
+					title TEXT,
+					user_rating REAL,
+					track_number INT,
+					file_path TEXT,
+					updated_at INT
+				);
+				CREATE INDEX IF NOT EXISTS idx_tracks_title ON tracks(title);
+				CREATE TABLE IF NOT EXISTS library_state (
+					section_id INTEGER PRIMARY KEY,
+					updated_at INT
+				);
+			""")
+		except Exception as e:
+			self.logger.warning('Unable to open metadata cache: {}'.format(e))
+			self.cache_conn = None
+
+	def _library_updated_at(self):
+		updated_at = self.music_library.updatedAt
+		return int(updated_at.timestamp()) if updated_at else 0
+
+	def _cached_library_state(self):
+		"""Return the library updatedAt recorded in the cache, or None"""
+		if self.cache_conn is None:
+			return None
+		state = self.cache_conn.execute(
+			"SELECT updated_at FROM library_state WHERE section_id = ?",
+			(self.music_library.key,)).fetchone()
+		return state[0] if state else None
+
+	def _rated_tags_from_cache(self) -> List[AudioTag]:
+		"""Rebuild AudioTags for every rated track of the current section
+		stored in the cache"""
+		tags = []
+		rows = self.cache_conn.execute(
+			"SELECT key, artist, album, title, user_rating, track_number, file_path"
+			" FROM tracks WHERE user_rating > 0 AND section_id = ?",
+			(self.music_library.key,))
+		for key, artist, album, title, user_rating, track_number, file_path in rows:
+			tag = AudioTag(artist=artist, album=album, title=title, file_path=file_path)
+			tag.rating = self.get_normed_rating(user_rating)
+			tag.ID = '/library/metadata/{}'.format(key)
+			tag.track = track_number
+			tags.append(tag)
+		return tags
+
+	def _track_to_cache_row(self, track: plexapi.audio.Track):
+		return (
+			track.ratingKey,
+			self.music_library.key,
+			track.grandparentTitle,
+			track.parentTitle,
+			track.title,
+			track.userRating,
+			track.index,
+			track.locations[0] if track.locations else '',
+			int(track.updatedAt.timestamp()) if track.updatedAt else 0
+		)
+
+	def _store_rated_tracks(self, tracks: List[plexapi.audio.Track]):
+		"""
+		Rewrite the metadata cache from freshly fetched tracks and record the
+		library state they correspond to.
+		"""
+		if self.cache_conn is None:
+			return
+		rows = [self._track_to_cache_row(track) for track in tracks]
+		with self.cache_conn:
+			self.cache_conn.execute(
+				"DELETE FROM tracks WHERE section_id = ?", (self.music_library.key,))
+			self.cache_conn.executemany(
+				"INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+			self.cache_conn.execute(
+				"INSERT OR REPLACE INTO library_state VALUES (?, ?)",
+				(self.music_library.key, self._library_updated_at()))
+
+	def _fetch_cache_rows(self, keys):
+		"""Fetch the full metadata for the given rating keys in a few large
+		multi-key requests and convert the tracks to cache rows"""
+		keys = list(keys)
+		rows = []
+		for offset in range(0, len(keys), self.metadata_fetch_chunk_size):
+			chunk = keys[offset:offset + self.metadata_fetch_chunk_size]
+			for track in self.plex_api_connection.fetchItems(chunk):
+				track._autoReload = False
+				rows.append(self._track_to_cache_row(track))
+		return rows
+
+	def _delta_refresh_cache(self) -> Optional[List[AudioTag]]:
+		"""
+		Reconcile the metadata cache against the server, then serve the
+		rated set from the cache. Changed tracks are found by timestamp:
+		updatedAt for metadata edits, and lastRatedAt for ratings changed in
+		Plex itself, which only touch the per-account lastRatedAt. Steady-
+		state syncs thus download the delta instead of every rated track.
+		:return: the rated tracks after the refresh, or None when there is
+			no previous state to diff against
+		"""
+		last_sync = self._cached_library_state()
+		if not last_sync:
+			return None
+
+		# Restricted to rated tracks so a library-wide metadata refresh does
+		# not pull full metadata for tracks the sync never looks at; unrated
+		# tracks are handled by the pruning below
+		changed = self.music_library.searchTracks(
+			container_size=self.search_container_size,
+			filters={'and': [
+				{'track.userRating!': 0},
+				{'or': [
+					{'track.updatedAt>>=': last_sync},
+					{'track.lastRatedAt>>=': last_sync},
+				]},
+			]})
+		self.logger.info('Refreshing metadata cache: {} rated tracks changed since last sync'.format(len(changed)))
+
+		# The delta search never reports removals, so reconcile against the
+		# server's rated key set (partial results only, one paged search):
+		# prune cached tracks that were deleted or unrated since, and fetch
+		# rated tracks the cache has never seen
+		server_keys = {track.ratingKey for track in self.music_library.searchTracks(
+			container_size=self.search_container_size, **{'track.userRating!': '0'})}
+		cached_keys = {row[0] for row in self.cache_conn.execute(
+			"SELECT key FROM tracks WHERE user_rating > 0 AND section_id = ?",
+			(self.music_library.key,))}
+		missing_keys = server_keys - cached_keys - {track.ratingKey for track in changed}
+		if missing_keys:
+			self.logger.debug('Fetching {} rated tracks missing from the cache'.format(len(missing_keys)))
+		rows = self._fetch_cache_rows([track.ratingKey for track in changed]) + self._fetch_cache_rows(missing_keys)
+
+		with self.cache_conn:
+			self.cache_conn.executemany(
+				"INSERT OR REPLACE INTO tracks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+			stale_keys = cached_keys - server_keys
+			if stale_keys:
+				self.logger.debug('Pruning {} tracks no longer rated on the server'.format(len(stale_keys)))
+				self.cache_conn.executemany(
+					"DELETE FROM tracks WHERE key = ?", [(key,) for key in stale_keys])
+			self.cache_conn.execute(
+				"INSERT OR REPLACE INTO library_state VALUES (?, ?)",
+				(self.music_library.key, self._library_updated_at()))
+		return self._rated_tags_from_cache()
+
+	def _cache_rating(self, rating_key, native_rating):
+		"""Write a rating through to the metadata cache"""
+		if self.cache_conn is None or rating_key is None:
+			return
+		with self.cache_conn:
+			self.cache_conn.execute(
+				"UPDATE tracks SET user_rating = ? WHERE key = ?", (native_rating, rating_key))
 
 	def read_track_metadata(self, track: plexapi.audio.Track) -> AudioTag:
 		tag = AudioTag(artist=track.grandparentTitle, album=track.parentTitle, title=track.title, file_path=track.locations[0])
@@ -536,24 +1078,51 @@ class PlexPlayer(MediaPlayer):
 			self.logger.debug('Playlist {} not found on the remote player'.format(title))
 			return None
 
-	def search_tracks(self, key: str, value: Union[bool, str]) -> List[AudioTag]:
+	def search_tracks(self, key: str, value: Union[bool, str], limit: Optional[int] = None) -> List[AudioTag]:
+		"""Search the Plex music library for tracks
+		:param key: Search mode ('title' or 'rating')
+		:param value: The value to search for
+		:param limit: Stop fetching after this many matches; common titles
+			can return hundreds of results otherwise
+		"""
 		if not value:
 			raise ValueError(f"value can not be empty.")
 		if key == "title":
-			matches = self.music_library.searchTracks(title=value)
+			# Page the container so the server streams moderate responses
+			# instead of rendering one giant result set
+			matches = self.music_library.searchTracks(
+				title=value, container_size=self.title_search_container_size, limit=limit)
 			n_matches = len(matches)
 			s_matches = f"match{'es' if n_matches > 1 else ''}"
 			self.logger.debug(f'Found {n_matches} {s_matches} for query title={value}')
 		elif key == "rating":
 			if value is True:
 				value = "0"
-			matches = self.music_library.searchTracks(**{'track.userRating!': value})
-			tags = []
-			counter = 0
-			for x in matches:
-				tags.append(self.read_track_metadata(x))
-				counter += 1
-			self.logger.info('Found {} tracks with a rating > 0 that need syncing'.format(counter))
+			if value == "0":
+				# An unchanged section timestamp can still hide rating
+				# changes made in Plex, so the cache is always reconciled
+				# against the server before it is served
+				cached = self._delta_refresh_cache()
+				if cached is not None:
+					self.logger.info('Found {} rated tracks in the local metadata cache'.format(len(cached)))
+					return cached
+			matches = self.music_library.searchTracks(
+				container_size=self.search_container_size, **{'track.userRating!': value})
+			# Bulk-load the full metadata of all matches in a few large
+			# requests. Reading attributes off the partial search results
+			# would otherwise let plexapi lazily reload tracks one HTTP
+			# round trip at a time.
+			keys = [track.ratingKey for track in matches]
+			full_tracks = []
+			for offset in range(0, len(keys), self.metadata_fetch_chunk_size):
+				chunk = keys[offset:offset + self.metadata_fetch_chunk_size]
+				for track in self.plex_api_connection.fetchItems(chunk):
+					track._autoReload = False
+					full_tracks.append(track)
+			tags = [self.read_track_metadata(track) for track in full_tracks]
+			if value == "0":
+				self._store_rated_tracks(full_tracks)
+			self.logger.info('Found {} tracks with a rating > 0 that need syncing'.format(len(tags)))
 			matches = tags
 		else:
 			raise KeyError(f"Invalid search mode {key}.")
@@ -567,21 +1136,40 @@ class PlexPlayer(MediaPlayer):
 		:return:
 		"""
 		if present:
-			self.logger.debug('Adding {} to playlist {}'.format(self.format(track), playlist.title))
+			self.logger.debug('Adding %s to playlist %s', self.format_cached(track), playlist.title)
 			if not self.dry_run:
 				playlist.addItems(track)
 		else:
-			self.logger.debug('Removing {} from playlist {}'.format(self.format(track), playlist.title))
+			self.logger.debug('Removing %s from playlist %s', self.format_cached(track), playlist.title)
 			if not self.dry_run:
 				playlist.removeItem(track)
 
+	def _resolve_by_title_and_key(self, title, key):
+		"""
+		Find the library track with the given title and rating key. The result
+		is memoized so repeated updates within a sync batch issue only one
+		search request per track.
+		:type title: str
+		:type key: str
+		:rtype: plexapi.audio.Track
+		"""
+		cache_key = (title, key)
+		song = self._track_cache.get(cache_key)
+		if song is None:
+			song = next(s for s in self.music_library.searchTracks(title=title) if s.key == key)
+			self._track_cache[cache_key] = song
+		return song
+
 	def update_rating(self, track, rating):
-		self.logger.debug('Updating rating of track "{}" to {} stars'.format(
-			self.format(track), self.get_5star_rating(rating))
-		)
+		self.logger.debug('Updating rating of track "%s" to %s stars',
+			self.format_cached(track), self.get_5star_rating(rating))
 		if not self.dry_run:
+			native_rating = self.get_native_rating(rating)
 			try:
-				track.edit(**{'userRating.value': self.get_native_rating(rating)})
+				track.edit(**{'userRating.value': native_rating})
+				rating_key = track.ratingKey
 			except AttributeError:
-				song = [s for s in self.music_library.searchTracks(title=track.title) if s.key == track.ID][0]
-				song.edit(**{'userRating.value': self.get_native_rating(rating)})
+				song = self._resolve_by_title_and_key(track.title, track.ID)
+				song.edit(**{'userRating.value': native_rating})
+				rating_key = song.ratingKey
+			self._cache_rating(rating_key, native_rating)
@@ -2,6 +2,9 @@ from typing import List
 
 
 class AudioTag(object):
+	# One AudioTag exists per track in the library, so skip the per-instance
+	# __dict__ and store the attributes in a fixed slot array instead
+	__slots__ = ('album', 'artist', 'title', 'rating', 'genre', 'file_path', 'ID', 'track')
 
 	def __init__(self, artist='', album='', title='', file_path=None):
 		self.album = album
@@ -10,12 +13,15 @@ class AudioTag(object):
 		self.rating = 0
 		self.genre = ''
 		self.file_path = file_path
+		self.ID = None
+		self.track = 0
 
 	def __str__(self):
 		return ' - '.join([self.artist, self.album, self.title])
 
 
 class Playlist(object):
+	__slots__ = ('name', 'tracks', 'is_auto_playlist')
 
 	def __init__(self, name, parent_name=''):
 		"""
@@ -16,6 +16,7 @@ class InfoFilter(logging.Filter):
 
 
 class PlexSync:
+	update_batch_size = 500
 	log_levels = {
 		'CRITICAL': logging.CRITICAL,
 		'ERROR': logging.ERROR,
@@ -129,13 +130,14 @@ class PlexSync:
 				raise ValueError('Invalid sync item selected: {}'.format(sync_item))
 
 	def sync_tracks(self):
-		tracks = self.source_player.search_tracks(key="rating", value=True)
-		self.logger.info('Attempting to match {} tracks'.format(len(tracks)))
-		sync_pairs = [TrackPair(self.source_player, self.destination_player, track) for track in tracks]
-
 		self.logger.info('Matching source tracks with destination player')
+		# Consume the source search as a stream, so matching against the
+		# destination overlaps with the source player still reading tracks
+		sync_pairs = []
 		matched = 0
-		for pair in sync_pairs:
+		for track in self.source_player.iter_search_tracks(key="rating", value=True):
+			pair = TrackPair(self.source_player, self.destination_player, track)
+			sync_pairs.append(pair)
 			if pair.match():
 				matched += 1
 		self.logger.info('Matched {}/{} tracks'.format(matched, len(sync_pairs)))
@@ -144,8 +146,13 @@ class PlexSync:
 			self.logger.info('Running a DRY RUN. No changes will be propagated!')
 		pairs_need_update = [pair for pair in sync_pairs if pair.sync_state is SyncState.NEEDS_UPDATE]
 		self.logger.info('Synchronizing {} matching tracks without conflicts'.format(len(pairs_need_update)))
-		for pair in pairs_need_update:
-			pair.sync()
+		# Accumulate the pending updates and flush them in chunks, so players
+		# that support it can apply a whole batch in one transaction
+		pending = [
+			(pair.destination, pair.rating_source)
+			for pair in pairs_need_update if pair.rating_destination <= 0.0]
+		for offset in range(0, len(pending), self.update_batch_size):
+			self.destination_player.update_ratings(pending[offset:offset + self.update_batch_size])
 
 		pairs_conflicting = [pair for pair in sync_pairs if pair.sync_state is SyncState.CONFLICTING]
 		self.logger.info('{} pairs have conflicting ratings'.format(len(pairs_conflicting)))